@@ -11,20 +11,17 @@ Example:
     python play_midi.py library/song.mid 1 auto  # auto-analyze and suggest transpose
 """
 
+import gc
 import sys
-from src import (
-    find_printer_port,
-    connect_to_printer,
-    AbsolutePositionTracker,
-    MotionPlanner,
-    NotePlayer,
-    initialize_printer_position,
-    send_gcode_with_retry,
-    SAFE_LIMITS,
-    FREQUENCY_RANGES,
-    Transposer,
-)
-from src.midi_parser import parse_midi_file, extract_melody_with_rests, print_melody_summary
+import time
+
+from src.config import FREQUENCY_RANGES, SAFE_LIMITS
+from src.exceptions import CommandTimeoutError, GCodeError
+from src.midi_parser import extract_melody_with_rests, parse_midi_file, print_melody_summary, transpose_notes
+from src.transposer import Transposer
+
+# Print progress for every Nth note only; printing every note delays the serial sends
+PROGRESS_INTERVAL = 16
 
 if len(sys.argv) < 2:
     print("Usage: python play_midi.py <midi_file> [track_index] [transpose_semitones]")
@@ -83,10 +80,10 @@ try:
             transposed_notes
         )
 
-    # Parse again with the chosen transpose
+    # Apply the chosen transpose to the already-parsed notes
     if transpose_semitones != 0:
         print(f"\n=== Applying Transpose: {transpose_semitones:+d} semitones ===")
-        notes, _ = parse_midi_file(midi_path, track_index=selected_track, tempo_scale=1.0, transpose_semitones=transpose_semitones)
+        notes = transpose_notes(notes_original, transpose_semitones)
         print_melody_summary(notes)
     else:
         notes = notes_original
@@ -97,9 +94,10 @@ try:
 
     # Skip long rests at the beginning (>5 seconds)
     print("Skipping intro rests...")
-    while melody and melody[0][0] is None and melody[0][1] > 5.0:
-        print(f"  Skipping {melody[0][1]:.1f}s rest")
-        melody.pop(0)
+    intro_rests = melody.count_intro_rests(min_duration=5.0)
+    for rest_duration in melody.dur[:intro_rests].tolist():
+        print(f"  Skipping {rest_duration:.1f}s rest")
+    melody = melody[intro_rests:]
 
     print(f"Playing {len(melody)} events")
 
@@ -107,6 +105,18 @@ except Exception as e:
     print(f"Error parsing MIDI file: {e}")
     sys.exit(1)
 
+# Import the printer stack only once there is something to play
+from src.printer import (  # noqa: E402
+    AbsolutePositionTracker,
+    MotionPlanner,
+    NotePlayer,
+    connect_to_printer,
+    find_printer_port,
+    initialize_printer_position,
+    raise_process_priority,
+    send_gcode_with_retry,
+)
+
 # Connect to printer
 print("\n=== Connecting to Printer ===")
 port = find_printer_port()
@@ -125,27 +135,43 @@ try:
 
     # Play the melody
     print(f"=== Playing Track {selected_track} ===\n")
+    muted = melody.mute_unplayable(player.can_play)
+    if muted:
+        print(f"⚠ Muting {muted} note(s) outside the playable range\n")
+    player.precompute(melody)
+
+    # Keep the scheduler and garbage collector from interrupting notes
+    raise_process_priority()
+    gc.disable()
+
+    # Schedule every event against one start time so timing errors don't accumulate
+    end_times = melody.end_times().tolist()
+    t_start = time.perf_counter()
 
     for i, (frequency, duration, volume) in enumerate(melody):
+        deadline = t_start + end_times[i]
         if frequency is None:
             # Rest (pause)
             print(f"[{i+1}/{len(melody)}] Rest: {duration:.2f}s")
-            player.pause(duration)
+            player.pause(duration, deadline=deadline)
         else:
             # Note - all notes now play diagonally
             # For single note, pass same frequency twice
-            print(f"[{i+1}/{len(melody)}] {frequency:.1f} Hz for {duration:.2f}s (volume: {volume})")
+            if i % PROGRESS_INTERVAL == 0:
+                print(f"[{i+1}/{len(melody)}] {frequency:.1f} Hz for {duration:.2f}s (volume: {volume})")
             try:
                 # Play as diagonal movement (same frequency on both axes for single note)
-                player.play_note(frequency, frequency, duration, volume=volume, debug=False)
-            except Exception as e:
+                player.play_note(frequency, frequency, duration, volume=volume, debug=False, deadline=deadline)
+            except (CommandTimeoutError, GCodeError) as e:
+                # Range problems were muted up front; skip notes the printer rejected
                 print(f"  ⚠ Skipping note: {e}")
-                # Skip notes that can't be played
-                player.pause(duration)
+                player.pause(duration, deadline=deadline)
 
     print("\n✓ Playback complete!")
 
 finally:
+    gc.collect()
+    gc.enable()
     print("\nCleaning up...")
     send_gcode_with_retry(ser, "M84")
     ser.close()
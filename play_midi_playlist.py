@@ -17,25 +17,29 @@ Features:
 """
 
 import argparse
+import functools
+import gc
+import os
 import signal
 import sys
-from typing import Optional
-
-from src import (
-    find_printer_port,
-    connect_to_printer,
-    AbsolutePositionTracker,
-    MotionPlanner,
-    NotePlayer,
-    initialize_printer_position,
-    send_gcode_with_retry,
-    SAFE_LIMITS,
-    FREQUENCY_RANGES,
-    Transposer,
-)
-from src.midi_parser import parse_midi_file, extract_melody_with_rests, print_melody_summary
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from src.config import FREQUENCY_RANGES, SAFE_LIMITS
+from src.exceptions import CommandTimeoutError, GCodeError
+from src.midi_parser import Melody, extract_melody_with_rests, parse_midi_file, print_melody_summary, transpose_notes
 from src.playlist_manager import PlaylistManager
+from src.transposer import Transposer
+
+if TYPE_CHECKING:
+    from src.printer import NotePlayer
+
 
+# Print progress for every Nth note only; printing every note delays the serial sends
+PROGRESS_INTERVAL = 16
 
 # Global flag for interrupt handling
 interrupted = False
@@ -89,9 +93,70 @@ def parse_transpose_value(transpose_value) -> tuple[bool, int]:
     return False, int(transpose_value)
 
 
+@functools.lru_cache(maxsize=64)
+def _cached_parse(
+    filename: str,
+    mtime: float,
+    track_index: Optional[int],
+    start_seconds: float,
+    end_seconds: Optional[float]
+) -> tuple[np.ndarray, int]:
+    """
+    Parse a MIDI file, reusing the result if the same file and window were parsed before.
+
+    The file's modification time is part of the cache key, so editing a MIDI
+    file on disk forces a fresh parse. Parsing is silent, since it may run on
+    the parse-ahead thread while another track is printing progress.
+
+    Args:
+        filename: Path to MIDI file
+        mtime: Modification time of the file (cache key only)
+        track_index: Track to extract (None = auto-select)
+        start_seconds: Start of time window in seconds
+        end_seconds: End of time window in seconds (None = end of file)
+
+    Returns:
+        Tuple of (notes, selected_track_index), with notes as a read-only NOTE_DTYPE array
+    """
+    notes, selected_track = parse_midi_file(
+        filename,
+        track_index=track_index,
+        tempo_scale=1.0,
+        start_time=start_seconds,
+        end_time=end_seconds,
+        verbose=False
+    )
+    # Shared between cache hits, so guard against in-place edits
+    notes.flags.writeable = False
+    return notes, selected_track
+
+
+def prefetch_item(item: dict) -> None:
+    """
+    Parse a playlist item into the parse cache ahead of time.
+
+    Runs on a background thread while the previous track plays. Any error
+    stays in the returned Future; lru_cache doesn't cache exceptions, so the
+    main loop's own parse of the item raises it again and reports it.
+
+    Args:
+        item: Playlist item dictionary
+    """
+    filename = item.get('filename')
+    if filename is None:
+        return
+    _cached_parse(
+        filename,
+        os.path.getmtime(filename),
+        parse_track_value(item.get('track')),
+        item.get('start_seconds', 0),
+        item.get('end_seconds')
+    )
+
+
 def play_track(
-    player: NotePlayer,
-    melody: list,
+    player: "NotePlayer",
+    melody: Melody,
     track_name: str,
     item_index: int
 ) -> bool:
@@ -100,7 +165,7 @@ def play_track(
 
     Args:
         player: NotePlayer instance
-        melody: Melody sequence (list of (frequency, duration, volume) tuples)
+        melody: Melody sequence of (frequency, duration, volume) events
         track_name: Name of track for display
         item_index: Index in playlist for display
 
@@ -110,6 +175,14 @@ def play_track(
     global skip_current_track
 
     print(f"\n=== Playing Track {item_index + 1}: {track_name} ===\n")
+    muted = melody.mute_unplayable(player.can_play)
+    if muted:
+        print(f"⚠ Muting {muted} note(s) outside the playable range\n")
+    player.precompute(melody)
+
+    # Schedule every event against one start time so timing errors don't accumulate
+    end_times = melody.end_times().tolist()
+    t_start = time.perf_counter()
 
     for i, (frequency, duration, volume) in enumerate(melody):
         # Check for interrupt
@@ -117,18 +190,21 @@ def play_track(
             print("\n⚠ Track skipped")
             return False
 
+        deadline = t_start + end_times[i]
         if frequency is None:
             # Rest (pause)
             print(f"[{i+1}/{len(melody)}] Rest: {duration:.2f}s")
-            player.pause(duration)
+            player.pause(duration, deadline=deadline)
         else:
             # Note
-            print(f"[{i+1}/{len(melody)}] {frequency:.1f} Hz for {duration:.2f}s (volume: {volume})")
+            if i % PROGRESS_INTERVAL == 0:
+                print(f"[{i+1}/{len(melody)}] {frequency:.1f} Hz for {duration:.2f}s (volume: {volume})")
             try:
-                player.play_note(frequency, frequency, duration, volume=volume, debug=False)
-            except Exception as e:
+                player.play_note(frequency, frequency, duration, volume=volume, debug=False, deadline=deadline)
+            except (CommandTimeoutError, GCodeError) as e:
+                # Range problems were muted up front; skip notes the printer rejected
                 print(f"  ⚠ Skipping note: {e}")
-                player.pause(duration)
+                player.pause(duration, deadline=deadline)
 
     print("\n✓ Track complete!")
     return True
@@ -144,9 +220,25 @@ def main():
     parser.add_argument('--shuffle', action='store_true', help='Shuffle the playlist')
     args = parser.parse_args()
 
+    # Import the printer stack only once the arguments are valid
+    from src.printer import (
+        AbsolutePositionTracker,
+        MotionPlanner,
+        NotePlayer,
+        connect_to_printer,
+        find_printer_port,
+        initialize_printer_position,
+        raise_process_priority,
+        send_gcode_with_retry,
+    )
+
     # Set up interrupt handler
     signal.signal(signal.SIGINT, signal_handler)
 
+    # Keep the scheduler from interrupting notes. No CPU pinning: the
+    # parse-ahead worker needs its own core, not the playback thread's
+    raise_process_priority(pin_cpu=False)
+
     print(f"=== MIDI Playlist Player ===")
     print(f"Playlist: {args.playlist}")
     if args.shuffle:
@@ -185,6 +277,10 @@ def main():
     planner = MotionPlanner(SAFE_LIMITS)
     player = NotePlayer(ser, tracker, planner)
 
+    # One background worker parses the next track while the current one plays
+    executor = ThreadPoolExecutor(max_workers=1)
+    prefetch: Optional[Future] = None
+
     try:
         print("Initializing printer (homing)...")
         initialize_printer_position(ser, tracker)
@@ -197,9 +293,9 @@ def main():
             interrupted = False
             skip_current_track = False
 
-            # Reload playlist from YAML (allows live editing)
+            # Reload playlist from YAML if it was edited (allows live editing)
             try:
-                playlist_manager.load_playlist()
+                playlist_manager.reload_if_changed()
             except Exception as e:
                 print(f"Error reloading playlist: {e}")
                 break
@@ -236,20 +332,27 @@ def main():
             track_index = parse_track_value(track_value)
             auto_transpose, transpose_semitones = parse_transpose_value(transpose_value)
 
+            # Let any parse-ahead finish so its result is in the cache. Only
+            # wait: a failed parse-ahead is reported by the parse below
+            if prefetch is not None:
+                wait([prefetch])
+                prefetch = None
+
             # Parse MIDI file
             try:
                 print(f"Parsing MIDI file: {filename}")
 
-                # First parse without transposition to analyze
-                notes_original, selected_track = parse_midi_file(
+                # First parse without transposition to analyze (memoized across loops)
+                notes_original, selected_track = _cached_parse(
                     filename,
-                    track_index=track_index,
-                    tempo_scale=1.0,
-                    start_time=start_seconds,
-                    end_time=end_seconds
+                    os.path.getmtime(filename),
+                    track_index,
+                    start_seconds,
+                    end_seconds
                 )
 
-                print(f"Found melody in track {selected_track}")
+                auto_note = " (auto-selected, highest average frequency)" if track_index is None else ""
+                print(f"Found melody in track {selected_track}{auto_note}")
                 print_melody_summary(notes_original)
 
                 # Handle auto-transpose
@@ -265,17 +368,10 @@ def main():
                     else:
                         print("No transposition needed")
 
-                # Parse again with the chosen transpose
+                # Apply the chosen transpose to the already-parsed notes
                 if transpose_semitones != 0:
                     print(f"\n=== Applying Transpose: {transpose_semitones:+d} semitones ===")
-                    notes, _ = parse_midi_file(
-                        filename,
-                        track_index=selected_track,
-                        tempo_scale=1.0,
-                        transpose_semitones=transpose_semitones,
-                        start_time=start_seconds,
-                        end_time=end_seconds
-                    )
+                    notes = transpose_notes(notes_original, transpose_semitones)
                     print_melody_summary(notes)
                 else:
                     notes = notes_original
@@ -286,9 +382,10 @@ def main():
 
                 # Skip long rests at the beginning (>5 seconds)
                 print("Skipping intro rests...")
-                while melody and melody[0][0] is None and melody[0][1] > 5.0:
-                    print(f"  Skipping {melody[0][1]:.1f}s rest")
-                    melody.pop(0)
+                intro_rests = melody.count_intro_rests(min_duration=5.0)
+                for rest_duration in melody.dur[:intro_rests].tolist():
+                    print(f"  Skipping {rest_duration:.1f}s rest")
+                melody = melody[intro_rests:]
 
                 print(f"Playing {len(melody)} events")
 
@@ -298,7 +395,13 @@ def main():
                 playlist_manager.mark_as_played(item_index)
                 continue
 
-            # Play the track
+            # Parse the following item while this one plays
+            upcoming = playlist_manager.peek_unplayed_item_after(item_index)
+            if upcoming is not None:
+                prefetch = executor.submit(prefetch_item, upcoming[1])
+
+            # Play the track, with garbage collection deferred until it ends
+            gc.disable()
             try:
                 completed = play_track(player, melody, filename, item_index)
 
@@ -307,12 +410,16 @@ def main():
 
             except Exception as e:
                 print(f"Error playing track: {e}")
+            finally:
+                gc.collect()
+                gc.enable()
 
             # Mark as played regardless of how it ended
             playlist_manager.mark_as_played(item_index)
             print(f"Marked track {item_index + 1} as played")
 
     finally:
+        executor.shutdown(wait=False)
         print("\n=== Cleaning Up ===")
         send_gcode_with_retry(ser, "M84")
         ser.close()
@@ -16,11 +16,12 @@ Example:
 """
 
 import sys
-import mido
 import pygame
+import symusic
 import time
 import threading
 from pathlib import Path
+from typing import cast
 
 
 class MIDIPreview:
@@ -35,7 +36,10 @@ class MIDIPreview:
         self.midi_path = midi_path
         self.preview_duration = preview_duration
         self.start_offset = start_offset
-        self.mid = mido.MidiFile(midi_path)
+        self.score = cast(
+            symusic.core.ScoreSecond,
+            symusic.Score.from_file(midi_path, ttype="second")
+        )
         self.paused = False
         self.stopped = False
         self.skip_requested = False
@@ -48,15 +52,9 @@ class MIDIPreview:
         """Extract information about all tracks in the MIDI file."""
         track_info = []
 
-        for i, track in enumerate(self.mid.tracks):
-            note_count = sum(1 for msg in track if msg.type == 'note_on' and msg.velocity > 0)
-            track_name = None
-
-            # Try to find track name
-            for msg in track:
-                if msg.type == 'track_name':
-                    track_name = msg.name
-                    break
+        for i, track in enumerate(self.score.tracks):
+            note_count = track.note_num()
+            track_name = track.name.strip()
 
             if note_count > 0:  # Only include tracks with notes
                 track_info.append({
@@ -69,47 +67,23 @@ class MIDIPreview:
 
     def create_preview_file(self, track_index: int, output_path: str):
         """Create a temporary MIDI file with just one track for the specified duration."""
-        new_mid = mido.MidiFile()
-        new_mid.ticks_per_beat = self.mid.ticks_per_beat
-
-        # Copy the track
-        original_track = self.mid.tracks[track_index]
-        new_track = mido.MidiTrack()
-
-        # Calculate time bounds
-        start_ticks = mido.second2tick(self.start_offset, self.mid.ticks_per_beat, 500000)
-        end_ticks = mido.second2tick(self.start_offset + self.preview_duration,
-                                      self.mid.ticks_per_beat, 500000)
-
-        current_tick = 0
-        tempo = 500000  # Default tempo
-
-        # Add messages within time range
-        for msg in original_track:
-            current_tick += msg.time
-
-            # Track tempo changes
-            if msg.type == 'set_tempo':
-                tempo = msg.tempo
-                if current_tick <= end_ticks:
-                    new_track.append(msg)
-            # Only include messages within preview range
-            elif current_tick >= start_ticks and current_tick <= end_ticks:
-                # Adjust timing for the first message
-                if len(new_track) == 0 or (len(new_track) == 1 and new_track[0].type == 'set_tempo'):
-                    adjusted_msg = msg.copy(time=0)
-                else:
-                    adjusted_msg = msg.copy()
-                new_track.append(adjusted_msg)
-            elif current_tick > end_ticks:
-                break
-
-        # Add end of track
-        new_track.append(mido.MetaMessage('end_of_track', time=0))
-        new_mid.tracks.append(new_track)
-        new_mid.save(output_path)
-
-        return new_mid
+        new_score = cast(
+            symusic.core.ScoreSecond,
+            symusic.Score(self.score.ticks_per_quarter, ttype="second")
+        )
+
+        # Copy the track (times are already in seconds, so tempo changes are baked in)
+        new_score.tracks.append(self.score.tracks[track_index].copy())
+
+        # Keep every note that starts inside the preview window and move it to
+        # the start of the file; notes running past the end are cut off when
+        # playback stops at preview_duration
+        end_offset = self.start_offset + self.preview_duration
+        new_score = new_score.clip(self.start_offset, end_offset, clip_end=False)
+        new_score = new_score.shift_time(-self.start_offset)
+        new_score.dump_midi(output_path)
+
+        return new_score
 
     def play_track_preview(self, track_index: int, track_name: str):
         """Play a preview of a specific track."""
@@ -1,7 +1,9 @@
 # 3D Printer Music - Production Primitives
+#
+# Kept free of the printer stack on purpose: importing any src submodule runs
+# this file first. Printer-facing primitives live in src.printer.
 
 from .config import BAUD_RATE, FREQUENCY_RANGES, MUSIC_Z_HEIGHT, SAFE_LIMITS, STEPS_PER_MM
-from .connection import connect_to_printer, find_printer_port
 from .exceptions import (
     CommandTimeoutError,
     ConnectionError,
@@ -9,39 +11,19 @@ from .exceptions import (
     OutOfBoundsError,
     PrinterMusicError,
 )
-from .gcode_sender import initialize_printer, send_gcode_with_retry
-from .motion_planner import MotionPlanner
-from .note_player import NotePlayer
-from .position_tracker import AbsolutePositionTracker, initialize_printer_position
 from .transposer import Transposer, create_transposer
 
 __all__ = [
-    # Connection
-    "find_printer_port",
-    "connect_to_printer",
-    # G-code
-    "send_gcode_with_retry",
-    "initialize_printer",
-    # Position tracking
-    "AbsolutePositionTracker",
-    "initialize_printer_position",
-    # Planning
-    "MotionPlanner",
-    # Note playing
-    "NotePlayer",
-    # Transposition
-    "Transposer",
-    "create_transposer",
-    # Exceptions
-    "PrinterMusicError",
-    "GCodeError",
-    "OutOfBoundsError",
-    "ConnectionError",
-    "CommandTimeoutError",
-    # Config
-    "SAFE_LIMITS",
+    "BAUD_RATE",
     "FREQUENCY_RANGES",
-    "STEPS_PER_MM",
     "MUSIC_Z_HEIGHT",
-    "BAUD_RATE",
+    "SAFE_LIMITS",
+    "STEPS_PER_MM",
+    "CommandTimeoutError",
+    "ConnectionError",
+    "GCodeError",
+    "OutOfBoundsError",
+    "PrinterMusicError",
+    "Transposer",
+    "create_transposer",
 ]
@@ -6,6 +6,10 @@ import serial
 
 from .exceptions import CommandTimeoutError, GCodeError
 
+# Max commands per batched write. Marlin's default serial receive buffer is
+# 128 bytes, which fits four G1 X/Y moves.
+MAX_BATCH_COMMANDS = 4
+
 
 def send_gcode(
     ser: serial.Serial,
@@ -126,6 +130,91 @@ def send_gcode_with_retry(
     raise CommandTimeoutError(f"Command timed out after {max_retries} attempts: {command}")
 
 
+def send_gcode_batch(
+    ser: serial.Serial,
+    commands: list[str],
+    max_retries: int = 50,
+    timeout: float = 5.0,
+    debug: bool = False
+) -> str:
+    """
+    Send several G-code commands with as few writes as possible.
+
+    Commands are written in chunks of up to MAX_BATCH_COMMANDS lines per
+    write, then one "ok" is awaited per command before the next chunk is sent.
+    A "busy" response restarts the timeout, up to max_retries times per
+    command, like send_gcode_with_retry().
+
+    Args:
+        ser: Serial connection
+        commands: G-code commands, in order
+        max_retries: Max "busy" responses tolerated while waiting for one "ok"
+        timeout: Max time to wait between responses (seconds)
+        debug: Print debug info (commands sent, responses)
+
+    Returns:
+        All responses from printer
+
+    Raises:
+        CommandTimeoutError: Exceeded retries or no response within timeout
+        GCodeError: Printer returned error
+    """
+    response_lines = []
+    # Bound once; the wait loop below polls these as fast as it can
+    now = time.time
+    readline = ser.readline
+
+    for chunk_start in range(0, len(commands), MAX_BATCH_COMMANDS):
+        chunk = commands[chunk_start:chunk_start + MAX_BATCH_COMMANDS]
+        if debug:
+            for command in chunk:
+                print(f">> {command}")
+
+        # Send the whole chunk in a single write
+        ser.write("".join(f"{command}\n" for command in chunk).encode())
+
+        # Wait for one "ok" per command
+        pending = len(chunk)
+        busy_count = 0
+        start_time = now()
+
+        while pending > 0:
+            if now() - start_time >= timeout:
+                raise CommandTimeoutError(
+                    f"Command timed out ({pending} of {len(chunk)} unacknowledged): {chunk[-pending]}"
+                )
+
+            if ser.in_waiting:
+                line = readline().decode().strip()
+                if line:  # Only add non-empty lines
+                    response_lines.append(line)
+                    if debug:
+                        print(f"<< {line}")
+
+                # Check response type
+                lowered = line.lower()
+                if "ok" in lowered:
+                    pending -= 1
+                    busy_count = 0
+                    start_time = now()
+
+                elif "busy" in lowered:
+                    # Printer busy, keep waiting for "ok" unless it never stops
+                    busy_count += 1
+                    if busy_count >= max_retries:
+                        raise CommandTimeoutError(
+                            f"Command timed out after {max_retries} busy responses: {chunk[-pending]}"
+                        )
+                    if debug:
+                        print("   (Printer busy, waiting for 'ok'...)")
+                    start_time = now()
+
+                elif "error" in lowered:
+                    raise GCodeError(f"Printer error: {line}")
+
+    return "\n".join(response_lines)
+
+
 def initialize_printer(ser: serial.Serial) -> None:
     """
     Initialize printer for music playback.
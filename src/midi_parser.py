@@ -1,54 +1,143 @@
 """MIDI file parsing for 3D printer music."""
 
-from typing import List, Tuple, Optional
-import mido
+import math
+from typing import Callable, Iterator, List, Tuple, Optional, cast
+import numpy as np
+import symusic
 
 
-class Note:
-    """Represents a musical note with timing and dynamics."""
+# Structured dtype for parsed notes: one row per note
+NOTE_DTYPE = np.dtype([
+    ("start_time", "f4"),  # Start time in seconds from beginning
+    ("duration", "f4"),    # Duration in seconds
+    ("frequency", "f4"),   # Frequency in Hz
+    ("velocity", "u1"),    # MIDI velocity (0-127), used for volume mapping
+])
 
-    def __init__(
-        self,
-        frequency: float,
-        duration: float,
-        velocity: int = 64,
-        start_time: float = 0.0
-    ):
+
+# Lowest MIDI velocity of the "normal" and "loud" volume modes
+VOLUME_VELOCITY_THRESHOLDS = (43, 85)
+
+# Auto track selection ignores tracks with fewer notes than this fraction
+# of the largest track
+MIN_TRACK_NOTE_FRACTION = 0.25
+
+
+def velocity_to_volume(velocity: int) -> str:
+    """
+    Map MIDI velocity to volume mode.
+
+    Velocity ranges:
+    - 0-42: soft (pp, p)
+    - 43-84: normal (mp, mf)
+    - 85-127: loud (f, ff, fff)
+
+    Args:
+        velocity: MIDI velocity (0-127)
+
+    Returns:
+        "soft", "normal", or "loud"
+    """
+    normal_min, loud_min = VOLUME_VELOCITY_THRESHOLDS
+    if velocity < normal_min:
+        return "soft"
+    elif velocity < loud_min:
+        return "normal"
+    else:
+        return "loud"
+
+
+def format_note(note: np.void) -> str:
+    """
+    Format a single note row for display.
+
+    Args:
+        note: One row of a NOTE_DTYPE array
+
+    Returns:
+        Human readable description of the note
+    """
+    velocity = int(note["velocity"])
+    return (
+        f"Note(freq={note['frequency']:.1f}Hz, dur={note['duration']:.2f}s, "
+        f"vel={velocity}, vol={velocity_to_volume(velocity)})"
+    )
+
+
+class Melody:
+    """
+    Playable melody stored as parallel arrays of frequency, duration and volume.
+
+    Rests are stored with a NaN frequency. Iterating yields
+    (frequency, duration, volume) tuples with None as the rest frequency.
+    """
+
+    def __init__(self, freq: np.ndarray, dur: np.ndarray, vol: np.ndarray):
         """
-        Initialize a note.
+        Initialize a melody.
 
         Args:
-            frequency: Frequency in Hz
-            duration: Duration in seconds
-            velocity: MIDI velocity (0-127), used for volume mapping
-            start_time: Start time in seconds from beginning
+            freq: Frequencies in Hz (NaN for rests)
+            dur: Durations in seconds
+            vol: Volume modes ("soft", "normal", or "loud")
         """
-        self.frequency = frequency
-        self.duration = duration
-        self.velocity = velocity
-        self.start_time = start_time
+        self.freq = freq
+        self.dur = dur
+        self.vol = vol
+
+    def __len__(self) -> int:
+        return len(self.freq)
+
+    def __getitem__(self, index: slice) -> "Melody":
+        return Melody(self.freq[index], self.dur[index], self.vol[index])
+
+    def __iter__(self) -> Iterator[Tuple[Optional[float], float, str]]:
+        for frequency, duration, volume in zip(self.freq.tolist(), self.dur.tolist(), self.vol.tolist()):
+            yield (None if math.isnan(frequency) else frequency), duration, volume
 
-    def get_volume(self) -> str:
+    def count_intro_rests(self, min_duration: float) -> int:
         """
-        Map MIDI velocity to volume mode.
+        Count the leading rests longer than min_duration.
 
-        Velocity ranges:
-        - 0-42: soft (pp, p)
-        - 43-84: normal (mp, mf)
-        - 85-127: loud (f, ff, fff)
+        Args:
+            min_duration: Rests longer than this (seconds) count as intro rests
 
         Returns:
-            "soft", "normal", or "loud"
+            Number of leading events to skip
         """
-        if self.velocity < 43:
-            return "soft"
-        elif self.velocity < 85:
-            return "normal"
-        else:
-            return "loud"
+        long_rest = np.isnan(self.freq) & (self.dur > min_duration)
+        if long_rest.all():
+            return len(self)
+        return int(np.argmax(~long_rest))
 
-    def __repr__(self) -> str:
-        return f"Note(freq={self.frequency:.1f}Hz, dur={self.duration:.2f}s, vel={self.velocity}, vol={self.get_volume()})"
+    def mute_unplayable(self, can_play: Callable[[float], bool]) -> int:
+        """
+        Turn notes that can't be played into rests of the same duration, in place.
+
+        Each distinct frequency is checked once.
+
+        Args:
+            can_play: Returns whether a frequency in Hz is playable
+
+        Returns:
+            Number of notes muted
+        """
+        frequencies = np.unique(self.freq[~np.isnan(self.freq)]).tolist()
+        unplayable = [frequency for frequency in frequencies if not can_play(frequency)]
+        if not unplayable:
+            return 0
+        muted = np.isin(self.freq, unplayable)
+        self.freq[muted] = np.nan
+        return int(np.count_nonzero(muted))
+
+    def end_times(self) -> np.ndarray:
+        """
+        Get the time each event ends, measured from the start of the melody.
+
+        Returns:
+            Cumulative durations in seconds (float64, so long songs don't drift)
+        """
+        return np.cumsum(self.dur, dtype=np.float64)
 
 
 def midi_note_to_frequency(midi_note: int) -> float:
@@ -64,8 +153,41 @@ def midi_note_to_frequency(midi_note: int) -> float:
     Returns:
         Frequency in Hz
     """
-    result: float = 440.0 * (2.0 ** ((midi_note - 69) / 12.0))
-    return result
+    return float(midi_notes_to_frequencies(np.asarray(midi_note, dtype=np.float64)))
+
+
+def midi_notes_to_frequencies(midi_notes: np.ndarray) -> np.ndarray:
+    """
+    Convert an array of MIDI note numbers to frequencies in Hz.
+
+    Vectorized form of midi_note_to_frequency(); fractional note numbers
+    (e.g. after transposition) are allowed.
+
+    Args:
+        midi_notes: MIDI note numbers
+
+    Returns:
+        Frequencies in Hz, as float64
+    """
+    return 440.0 * (2.0 ** ((midi_notes - 69) / 12.0))
+
+
+def transpose_notes(notes: np.ndarray, semitones: int) -> np.ndarray:
+    """
+    Transpose already-parsed notes without re-reading the MIDI file.
+
+    Each semitone multiplies frequency by 2^(1/12).
+
+    Args:
+        notes: NOTE_DTYPE array of notes
+        semitones: Number of semitones to transpose (positive = up, negative = down)
+
+    Returns:
+        New NOTE_DTYPE array of transposed notes
+    """
+    transposed_notes = notes.copy()
+    transposed_notes["frequency"] *= 2.0 ** (semitones / 12.0)
+    return transposed_notes
 
 
 def parse_midi_file(
@@ -74,8 +196,9 @@ def parse_midi_file(
     tempo_scale: float = 1.0,
     transpose_semitones: int = 0,
     start_time: float = 0.0,
-    end_time: Optional[float] = None
-) -> Tuple[List[Note], int]:
+    end_time: Optional[float] = None,
+    verbose: bool = True
+) -> Tuple[np.ndarray, int]:
     """
     Parse a MIDI file and extract notes with timing.
 
@@ -86,164 +209,120 @@ def parse_midi_file(
         transpose_semitones: Number of semitones to transpose (positive = up, negative = down)
         start_time: Start time in seconds (notes before this are filtered out)
         end_time: End time in seconds (notes after this are filtered out, None = no limit)
+        verbose: Print which track was auto-selected
 
     Returns:
         Tuple of (notes, selected_track_index)
-        - notes: List of Note objects with timing information
+        - notes: NOTE_DTYPE array of notes sorted by start time
         - selected_track_index: The track that was used (useful when auto-selecting)
     """
     try:
-        midi_file = mido.MidiFile(midi_path)
-    except ValueError as e:
-        if "attribute must be in range" in str(e):
-            raise ValueError(
-                f"MIDI file has corrupted metadata: {e}\n"
-                f"Try opening the file in GarageBand or another MIDI editor and re-exporting it."
-            )
-        raise
+        # Load directly in seconds so the tempo map is applied once, in C++
+        score = cast(
+            symusic.core.ScoreSecond,
+            symusic.Score.from_file(midi_path, ttype="second")
+        )
+    except RuntimeError as e:
+        raise ValueError(
+            f"MIDI file could not be read: {e}\n"
+            f"Try opening the file in GarageBand or another MIDI editor and re-exporting it."
+        )
 
     # Auto-select track if not specified
     if track_index is None:
-        track_index = _find_best_track(midi_file)
-        print(f"Auto-selected track {track_index} (highest average frequency)")
+        track_index = _find_best_track(score)
+        if verbose:
+            print(f"Auto-selected track {track_index} (highest average frequency)")
 
     # Get the track
-    if track_index >= len(midi_file.tracks):
-        raise ValueError(f"Track {track_index} not found. File has {len(midi_file.tracks)} tracks.")
-
-    track = midi_file.tracks[track_index]
-
-    # Extract notes
-    notes = []
-    current_time = 0.0  # Current time in seconds
-    active_notes = {}  # Map MIDI note number to start time and velocity
-
-    # Default tempo (500000 microseconds per beat = 120 BPM)
-    microseconds_per_beat = 500000
-
-    for msg in track:
-        # Convert delta time to seconds
-        delta_seconds = mido.tick2second(
-            msg.time,
-            midi_file.ticks_per_beat,
-            microseconds_per_beat
-        )
-        current_time += delta_seconds / tempo_scale
-
-        if msg.type == 'set_tempo':
-            # Update tempo
-            microseconds_per_beat = msg.tempo
-
-        elif msg.type == 'note_on' and msg.velocity > 0:
-            # Note starts
-            active_notes[msg.note] = (current_time, msg.velocity)
-
-        elif msg.type == 'note_off' or (msg.type == 'note_on' and msg.velocity == 0):
-            # Note ends
-            if msg.note in active_notes:
-                note_start_time, velocity = active_notes.pop(msg.note)
-                duration = current_time - note_start_time
-
-                # Apply transposition
-                transposed_note = msg.note + transpose_semitones
+    if not 0 <= track_index < len(score.tracks):
+        raise ValueError(f"Track {track_index} not found. File has {len(score.tracks)} tracks.")
 
-                # Convert MIDI note to frequency
-                frequency = midi_note_to_frequency(transposed_note)
+    track = score.tracks[track_index]
 
-                # Create note object
-                note = Note(
-                    frequency=frequency,
-                    duration=duration,
-                    velocity=velocity,
-                    start_time=note_start_time
-                )
-                notes.append(note)
+    # Extract notes as arrays (note on/off pairs are already matched by symusic)
+    # and convert timing and pitch for the whole track at once
+    arrays = track.notes.numpy()
+    start_times = arrays["time"].astype(np.float64) / tempo_scale
+    durations = arrays["duration"].astype(np.float64) / tempo_scale
+    frequencies = midi_notes_to_frequencies(arrays["pitch"].astype(np.float64) + transpose_semitones)
+    velocities = arrays["velocity"]
 
-    # Sort by start time
-    notes.sort(key=lambda n: n.start_time)
-
-    # Filter notes by time window if specified
+    # Filter notes by time window before filling the result, so a short
+    # window into a long file only pays for the notes it keeps
     if start_time > 0 or end_time is not None:
-        filtered_notes = []
-        for note in notes:
-            note_end = note.start_time + note.duration
-
-            # Skip notes that end before or at start_time
-            if note_end <= start_time:
-                continue
-
-            # Skip notes that start at or after end_time
-            if end_time is not None and note.start_time >= end_time:
-                continue
-
-            # Trim notes that overlap the boundaries
-            adjusted_note = Note(
-                frequency=note.frequency,
-                duration=note.duration,
-                velocity=note.velocity,
-                start_time=note.start_time
-            )
-
-            # Trim start if note begins before start_time
-            if note.start_time < start_time:
-                # Adjust duration and start time
-                overlap = start_time - note.start_time
-                adjusted_note.duration = note.duration - overlap
-                adjusted_note.start_time = start_time
-
-            # Trim end if note extends past end_time
-            if end_time is not None:
-                note_end_adjusted = adjusted_note.start_time + adjusted_note.duration
-                if note_end_adjusted > end_time:
-                    adjusted_note.duration = end_time - adjusted_note.start_time
-
-            filtered_notes.append(adjusted_note)
-
-        notes = filtered_notes
-
-        # Adjust all note start times to be relative to start_time
-        for note in notes:
-            note.start_time -= start_time
+        note_ends = start_times + durations
+
+        # Skip notes that end before or at start_time, or start at or after end_time
+        in_window = note_ends > start_time
+        if end_time is not None:
+            in_window &= start_times < end_time
+
+        start_times = start_times[in_window]
+        note_ends = note_ends[in_window]
+        frequencies = frequencies[in_window]
+        velocities = velocities[in_window]
+
+        # Trim notes that overlap the boundaries
+        start_times = np.maximum(start_times, start_time)
+        if end_time is not None:
+            note_ends = np.minimum(note_ends, end_time)
+        durations = note_ends - start_times
+
+        # Make start times relative to start_time
+        start_times -= start_time
+
+    # Fill the result sorted by start time (stable, so simultaneous notes keep file order)
+    order = np.argsort(start_times, kind="stable")
+    notes = np.empty(len(order), dtype=NOTE_DTYPE)
+    notes["start_time"] = start_times[order]
+    notes["duration"] = durations[order]
+    notes["frequency"] = frequencies[order]
+    notes["velocity"] = velocities[order]
 
     return notes, track_index
 
 
-def _find_best_track(midi_file: mido.MidiFile) -> int:
+def _find_best_track(score: symusic.core.ScoreSecond) -> int:
     """
     Find the track with the highest average frequency (likely the melody).
 
     The melody is typically in a higher register than bass or accompaniment parts.
+    Tracks with fewer than MIN_TRACK_NOTE_FRACTION of the largest track's notes
+    are skipped, so short fragments (e.g. single channels split out of a
+    type-0 file) don't beat the melody on pitch alone.
 
     Args:
-        midi_file: Loaded MIDI file
+        score: Loaded MIDI score
 
     Returns:
         Index of the best track to use
     """
+    note_counts = [track.note_num() for track in score.tracks]
+    if not note_counts:
+        return 0
+    min_notes = max(note_counts) * MIN_TRACK_NOTE_FRACTION
+
     best_track_index = 0
     highest_avg_freq = 0.0
 
-    for track_idx, track in enumerate(midi_file.tracks):
-        # Collect all note values from this track
-        note_values = []
-        for msg in track:
-            if msg.type == 'note_on' and msg.velocity > 0:
-                note_values.append(msg.note)
+    for track_idx, track in enumerate(score.tracks):
+        # Skip empty tracks and fragments much shorter than the main parts
+        if note_counts[track_idx] == 0 or note_counts[track_idx] < min_notes:
+            continue
 
-        # Calculate average frequency if track has notes
-        if note_values:
-            avg_note = sum(note_values) / len(note_values)
-            avg_freq = midi_note_to_frequency(int(avg_note))
+        avg_note = float(track.notes.numpy()["pitch"].mean())
+        avg_freq = midi_note_to_frequency(int(avg_note))
 
-            # Track with highest average frequency is usually the melody
-            if avg_freq > highest_avg_freq:
-                highest_avg_freq = avg_freq
-                best_track_index = track_idx
+        # Track with highest average frequency is usually the melody
+        if avg_freq > highest_avg_freq:
+            highest_avg_freq = avg_freq
+            best_track_index = track_idx
 
     return best_track_index
 
 
-def extract_melody_with_rests(notes: List[Note]) -> List[Tuple[Optional[float], float, str]]:
+def extract_melody_with_rests(notes: np.ndarray) -> Melody:
     """
     Extract melody as sequence of (frequency, duration, volume) with rests.
 
@@ -256,64 +335,66 @@ def extract_melody_with_rests(notes: List[Note]) -> List[Tuple[Optional[float],
     This is because the printer can only play one note at a time on a single axis.
 
     Args:
-        notes: List of Note objects (sorted by start_time)
+        notes: NOTE_DTYPE array of notes (sorted by start_time)
 
     Returns:
-        List of (frequency, duration, volume) tuples
+        Melody of (frequency, duration, volume) events
         - frequency is None for rests
         - duration in seconds
         - volume is "soft", "normal", or "loud"
     """
-    if not notes:
-        return []
+    if len(notes) == 0:
+        return Melody(np.empty(0), np.empty(0), np.empty(0, dtype=str))
 
     # Check if there's any velocity variation - if not, default to loud
-    velocities = [n.velocity for n in notes]
-    has_variation = len(set(velocities)) > 1
+    has_variation = len(np.unique(notes["velocity"])) > 1
     default_volume = "normal" if has_variation else "loud"
 
-    melody: List[Tuple[Optional[float], float, str]] = []
+    # Walk plain Python lists; indexing array rows one by one is slow
+    start_times = notes["start_time"].tolist()
+    durations = notes["duration"].tolist()
+    frequencies = notes["frequency"].tolist()
+    velocities = notes["velocity"].tolist()
+
+    melody: List[Tuple[float, float, str]] = []
     current_time = 0.0
     i = 0
 
     while i < len(notes):
-        note = notes[i]
+        note_start = start_times[i]
 
         # Add rest if needed
-        if note.start_time > current_time:
-            rest_duration = note.start_time - current_time
-            melody.append((None, rest_duration, default_volume))
-            current_time = note.start_time
+        if note_start > current_time:
+            rest_duration = note_start - current_time
+            melody.append((np.nan, rest_duration, default_volume))
+            current_time = note_start
 
         # Check for chord (multiple notes starting at same time)
         # Take the highest frequency note (usually the melody)
-        chord_notes = [note]
         j = i + 1
-        while j < len(notes) and abs(notes[j].start_time - note.start_time) < 0.01:  # Within 10ms
-            chord_notes.append(notes[j])
+        while j < len(notes) and abs(start_times[j] - note_start) < 0.01:  # Within 10ms
             j += 1
 
-        if len(chord_notes) > 1:
+        if j - i > 1:
             # Chord detected - take highest frequency (melody note)
-            melody_note = max(chord_notes, key=lambda n: n.frequency)
-            volume = melody_note.get_volume() if has_variation else default_volume
-            melody.append((melody_note.frequency, melody_note.duration, volume))
-            current_time = melody_note.start_time + melody_note.duration
-            i = j  # Skip all chord notes
+            melody_idx = max(range(i, j), key=lambda k: frequencies[k])
         else:
             # Single note
-            volume = note.get_volume() if has_variation else default_volume
-            melody.append((note.frequency, note.duration, volume))
-            current_time = note.start_time + note.duration
-            i += 1
+            melody_idx = i
+
+        volume = velocity_to_volume(velocities[melody_idx]) if has_variation else default_volume
+        melody.append((frequencies[melody_idx], durations[melody_idx], volume))
+        current_time = start_times[melody_idx] + durations[melody_idx]
+        i = j  # Skip all chord notes
 
-    return melody
+    freqs, melody_durations, volumes = zip(*melody)
+    return Melody(np.array(freqs), np.array(melody_durations), np.array(volumes))
 
 
 def analyze_transposition(
-    notes: List[Note],
+    notes: np.ndarray,
     target_freq_range: Tuple[float, float] = (1000.0, 12000.0)
-) -> Tuple[int, List[Note]]:
+) -> Tuple[int, np.ndarray]:
     """
     Analyze melody and suggest optimal transposition to higher frequencies.
 
@@ -321,7 +402,7 @@ def analyze_transposition(
     as much as possible while staying within the target range.
 
     Args:
-        notes: List of Note objects
+        notes: NOTE_DTYPE array of notes
         target_freq_range: (min, max) frequency range to target (default: 1-12kHz)
 
     Returns:
@@ -329,11 +410,11 @@ def analyze_transposition(
         - suggested_semitones: Number of semitones to transpose up (0 if no transpose needed)
         - transposed_notes: Notes with the suggested transposition applied
     """
-    if not notes:
+    if len(notes) == 0:
         return 0, notes
 
-    min_freq = min(n.frequency for n in notes)
-    max_freq = max(n.frequency for n in notes)
+    min_freq = float(notes["frequency"].min())
+    max_freq = float(notes["frequency"].max())
     target_min, target_max = target_freq_range
 
     # If already in good range, no need to transpose
@@ -357,40 +438,30 @@ def analyze_transposition(
 
     # Apply the best transposition
     if best_transpose > 0:
-        transposed_notes = []
-        for note in notes:
-            new_freq = note.frequency * (2.0 ** (best_transpose / 12.0))
-            transposed_notes.append(Note(
-                frequency=new_freq,
-                duration=note.duration,
-                velocity=note.velocity,
-                start_time=note.start_time
-            ))
-        return best_transpose, transposed_notes
+        return best_transpose, transpose_notes(notes, best_transpose)
     else:
         return 0, notes
 
 
-def print_melody_summary(notes: List[Note]) -> None:
+def print_melody_summary(notes: np.ndarray) -> None:
     """
     Print a summary of the melody.
 
     Args:
-        notes: List of Note objects
+        notes: NOTE_DTYPE array of notes
     """
-    if not notes:
+    if len(notes) == 0:
         print("No notes found!")
         return
 
     print(f"Total notes: {len(notes)}")
-    print(f"Duration: {notes[-1].start_time + notes[-1].duration:.1f}s")
-    print(f"Frequency range: {min(n.frequency for n in notes):.1f} - {max(n.frequency for n in notes):.1f} Hz")
-    print(f"Velocity range: {min(n.velocity for n in notes)} - {max(n.velocity for n in notes)}")
+    print(f"Duration: {notes[-1]['start_time'] + notes[-1]['duration']:.1f}s")
+    print(f"Frequency range: {notes['frequency'].min():.1f} - {notes['frequency'].max():.1f} Hz")
+    print(f"Velocity range: {notes['velocity'].min()} - {notes['velocity'].max()}")
 
-    # Count volume distribution
-    soft_count = sum(1 for n in notes if n.get_volume() == "soft")
-    normal_count = sum(1 for n in notes if n.get_volume() == "normal")
-    loud_count = sum(1 for n in notes if n.get_volume() == "loud")
+    # Count volume distribution (bins: soft, normal, loud)
+    volume_bins = np.digitize(notes["velocity"], VOLUME_VELOCITY_THRESHOLDS)
+    soft_count, normal_count, loud_count = np.bincount(volume_bins, minlength=3).tolist()
 
     print("\nVolume distribution:")
     print(f"  Soft: {soft_count} notes ({soft_count/len(notes)*100:.1f}%)")
@@ -400,4 +471,4 @@ def print_melody_summary(notes: List[Note]) -> None:
     # Show first few notes
     print("\nFirst 5 notes:")
     for i, note in enumerate(notes[:5]):
-        print(f"  {i+1}. {note}")
+        print(f"  {i+1}. {format_note(note)}")
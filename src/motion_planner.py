@@ -2,10 +2,14 @@
 
 import math
 import random
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from .config import STEPS_PER_MM
 
+# How sharply the direction probability changes near the boundaries.
+# Higher values = stronger boundary repulsion
+DIRECTION_STEEPNESS = 10.0
+
 
 class MotionPlanner:
     """
@@ -24,6 +28,17 @@ class MotionPlanner:
         """
         self.x_min, self.x_max = safe_limits["X"]
         self.y_min, self.y_max = safe_limits["Y"]
+        # mm/s per Hz for each axis, so conversions are a single multiply
+        self._velocity_coef = {axis: 1.0 / steps for axis, steps in STEPS_PER_MM.items()}
+        # Bound once; this is the module-level generator, so random.seed() still applies
+        self._rand = random.random
+        # Melodies reuse a few dozen pitches, so velocities are memoized per frequency pair
+        self._velocity_cache: Dict[Tuple[Optional[float], Optional[float]], Tuple[float, float, float]] = {}
+        # Centre and logistic scale (steepness / span) of each axis for direction choice
+        self._x_center = (self.x_min + self.x_max) / 2.0
+        self._y_center = (self.y_min + self.y_max) / 2.0
+        self._x_scale = DIRECTION_STEEPNESS / (self.x_max - self.x_min)
+        self._y_scale = DIRECTION_STEEPNESS / (self.y_max - self.y_min)
 
     def frequency_to_velocity(self, axis: str, frequency: float) -> float:
         """
@@ -38,16 +53,37 @@ class MotionPlanner:
         Returns:
             Velocity in mm/s
         """
-        steps_per_mm = STEPS_PER_MM[axis]
-        velocity = frequency / steps_per_mm
-        return velocity
+        return frequency * self._velocity_coef[axis]
+
+    def axis_velocities(
+        self,
+        freq_x: float | None,
+        freq_y: float | None
+    ) -> Tuple[float, float, float]:
+        """
+        Get per-axis and combined velocities for a frequency pair, memoized.
+
+        Args:
+            freq_x: X-axis frequency in Hz (None if X is unused)
+            freq_y: Y-axis frequency in Hz (None if Y is unused)
+
+        Returns:
+            Tuple of (vx, vy, v_total) in mm/s
+        """
+        key = (freq_x, freq_y)
+        velocities = self._velocity_cache.get(key)
+        if velocities is None:
+            vx = self.frequency_to_velocity("X", freq_x) if freq_x is not None else 0.0
+            vy = self.frequency_to_velocity("Y", freq_y) if freq_y is not None else 0.0
+            velocities = (vx, vy, math.sqrt(vx * vx + vy * vy))
+            self._velocity_cache[key] = velocities
+        return velocities
 
     def _choose_direction_probabilistic(
         self,
         current_pos: float,
-        min_bound: float,
-        max_bound: float,
-        steepness: float = 10.0
+        center: float,
+        scale: float
     ) -> int:
         """
         Choose movement direction using logistic function probability.
@@ -56,28 +92,26 @@ class MotionPlanner:
         approaches min, and vice versa. The logistic function creates
         smooth S-curve transitions with tunable boundary repulsion.
 
+        The boundary-dependent terms are precomputed per axis in __init__.
+
         Args:
             current_pos: Current position along the axis
-            min_bound: Minimum boundary
-            max_bound: Maximum boundary
-            steepness: Controls how sharply probability changes near boundaries.
-                      Higher values = stronger boundary repulsion (default: 10.0)
+            center: Midpoint between the axis boundaries
+            scale: DIRECTION_STEEPNESS divided by the axis span
 
         Returns:
             Direction: 1 (towards max) or -1 (towards min)
         """
-        # Normalize position to [0, 1] range
-        normalized_pos = (current_pos - min_bound) / (max_bound - min_bound)
-
-        # Apply logistic function centered at 0.5
-        # When normalized_pos = 0 (at min), sigmoid ≈ 1 → high prob to move positive
-        # When normalized_pos = 1 (at max), sigmoid ≈ 0 → high prob to move negative
-        # When normalized_pos = 0.5 (center), sigmoid = 0.5 → 50/50
-        x = steepness * (normalized_pos - 0.5)
+        # Apply logistic function centered at the middle of the axis;
+        # equivalent to steepness * (normalized_pos - 0.5) with normalized_pos in [0, 1]
+        # At min, sigmoid ≈ 1 → high prob to move positive
+        # At max, sigmoid ≈ 0 → high prob to move negative
+        # At center, sigmoid = 0.5 → 50/50
+        x = scale * (current_pos - center)
         probability_move_positive = 1.0 / (1.0 + math.exp(x))
 
         # Sample direction based on probability
-        return 1 if random.random() < probability_move_positive else -1
+        return 1 if self._rand() < probability_move_positive else -1
 
     def plan_movement(
         self,
@@ -110,12 +144,8 @@ class MotionPlanner:
                 - dir_x: Direction used for X axis (1, -1, or None if not used)
                 - dir_y: Direction used for Y axis (1, -1, or None if not used)
         """
-        # Calculate velocity components
-        vx = self.frequency_to_velocity("X", freq_x) if freq_x is not None else 0.0
-        vy = self.frequency_to_velocity("Y", freq_y) if freq_y is not None else 0.0
-
-        # Calculate total velocity
-        v_total = math.sqrt(vx * vx + vy * vy)
+        # Calculate velocity components and total velocity
+        vx, vy, v_total = self.axis_velocities(freq_x, freq_y)
 
         # Calculate total distance needed
         total_distance = v_total * duration
@@ -125,14 +155,24 @@ class MotionPlanner:
         dir_y = None
 
         if freq_x is not None:
-            dir_x = override_dir_x if override_dir_x is not None else self._choose_direction_probabilistic(x0, self.x_min, self.x_max)
+            dir_x = override_dir_x if override_dir_x is not None else self._choose_direction_probabilistic(x0, self._x_center, self._x_scale)
         if freq_y is not None:
-            dir_y = override_dir_y if override_dir_y is not None else self._choose_direction_probabilistic(y0, self.y_min, self.y_max)
+            dir_y = override_dir_y if override_dir_y is not None else self._choose_direction_probabilistic(y0, self._y_center, self._y_scale)
 
-        # Use ray marching to find all waypoints
         signed_vx = vx * dir_x if dir_x is not None else 0.0
         signed_vy = vy * dir_y if dir_y is not None else 0.0
-        waypoints = self._ray_march(x0, y0, signed_vx, signed_vy, total_distance)
+
+        # Most notes end inside the workspace, so try the straight line first
+        x_end = x0 + signed_vx * duration
+        y_end = y0 + signed_vy * duration
+        if total_distance > 1e-6 and self.x_min <= x_end <= self.x_max and self.y_min <= y_end <= self.y_max:
+            waypoints = [(x_end, y_end)]
+        else:
+            # Use ray marching to find all waypoints, bouncing off boundaries
+            waypoints = _ray_march(
+                x0, y0, signed_vx, signed_vy, total_distance,
+                self.x_min, self.x_max, self.y_min, self.y_max
+            )
 
         # Calculate feedrate (convert mm/s to mm/min)
         feedrate = v_total * 60.0
@@ -178,88 +218,99 @@ class MotionPlanner:
         assert dir_x is not None and dir_y is not None
         return waypoints, feedrate, dir_x, dir_y
 
-    def _ray_march(
-        self,
-        x: float,
-        y: float,
-        vx: float,
-        vy: float,
-        remaining_distance: float
-    ) -> List[Tuple[float, float]]:
-        """
-        Ray march through the workspace, bouncing off boundaries.
-
-        Args:
-            x: Current X position
-            y: Current Y position
-            vx: X velocity component (signed)
-            vy: Y velocity component (signed)
-            remaining_distance: Diagonal distance left to cover
 
-        Returns:
-            List of (x, y) waypoints
-        """
-        waypoints = []
-        epsilon = 1e-6  # Small value for floating point comparisons
-
-        while remaining_distance > epsilon:
-            # Calculate time to reach each boundary
-            if abs(vx) > epsilon:
-                if vx > 0:
-                    t_x = (self.x_max - x) / vx
-                else:
-                    t_x = (self.x_min - x) / vx
+def _ray_march(
+    x: float,
+    y: float,
+    vx: float,
+    vy: float,
+    remaining_distance: float,
+    x_min: float,
+    x_max: float,
+    y_min: float,
+    y_max: float
+) -> List[Tuple[float, float]]:
+    """
+    Ray march through the workspace, bouncing off boundaries.
+
+    Kept as a plain function with the bounds passed in, so the bounce loop
+    works on locals only.
+
+    Args:
+        x: Current X position
+        y: Current Y position
+        vx: X velocity component (signed)
+        vy: Y velocity component (signed)
+        remaining_distance: Diagonal distance left to cover
+        x_min: Minimum X boundary
+        x_max: Maximum X boundary
+        y_min: Minimum Y boundary
+        y_max: Maximum Y boundary
+
+    Returns:
+        List of (x, y) waypoints
+    """
+    waypoints = []
+    epsilon = 1e-6  # Small value for floating point comparisons
+
+    while remaining_distance > epsilon:
+        # Calculate time to reach each boundary
+        if abs(vx) > epsilon:
+            if vx > 0:
+                t_x = (x_max - x) / vx
             else:
-                t_x = float('inf')
+                t_x = (x_min - x) / vx
+        else:
+            t_x = float('inf')
 
-            if abs(vy) > epsilon:
-                if vy > 0:
-                    t_y = (self.y_max - y) / vy
-                else:
-                    t_y = (self.y_min - y) / vy
+        if abs(vy) > epsilon:
+            if vy > 0:
+                t_y = (y_max - y) / vy
             else:
-                t_y = float('inf')
-
-            # Take the minimum time (next bounce)
-            t_bounce = min(t_x, t_y)
-
-            # Calculate position at bounce
-            x_next = x + vx * t_bounce
-            y_next = y + vy * t_bounce
-
-            # Calculate distance traveled
-            dx = x_next - x
-            dy = y_next - y
-            segment_distance = math.sqrt(dx * dx + dy * dy)
-
-            # Check if this is the final segment
-            if segment_distance >= remaining_distance:
-                # Final position - move exactly remaining_distance
-                t_final = remaining_distance / math.sqrt(vx * vx + vy * vy)
-                x_final = x + vx * t_final
-                y_final = y + vy * t_final
-                waypoints.append((x_final, y_final))
-                break
+                t_y = (y_min - y) / vy
+        else:
+            t_y = float('inf')
+
+        # Take the minimum time (next bounce)
+        t_bounce = min(t_x, t_y)
+
+        # Calculate position at bounce
+        x_next = x + vx * t_bounce
+        y_next = y + vy * t_bounce
+
+        # Calculate distance traveled
+        dx = x_next - x
+        dy = y_next - y
+        segment_distance = math.sqrt(dx * dx + dy * dy)
+
+        # Check if this is the final segment
+        if segment_distance >= remaining_distance:
+            # Final position - move exactly remaining_distance
+            t_final = remaining_distance / math.sqrt(vx * vx + vy * vy)
+            x_final = x + vx * t_final
+            y_final = y + vy * t_final
+            waypoints.append((x_final, y_final))
+            break
+        else:
+            # Add waypoint at boundary
+            waypoints.append((x_next, y_next))
+            remaining_distance -= segment_distance
+
+            # Update position
+            x = x_next
+            y = y_next
+
+            # Flip velocity component(s) based on which boundary was hit
+            # Use epsilon for floating point comparison
+            if abs(t_x - t_y) < epsilon:
+                # Hit corner - flip both
+                vx = -vx
+                vy = -vy
+            elif t_x < t_y:
+                # Hit X boundary
+                vx = -vx
             else:
-                # Add waypoint at boundary
-                waypoints.append((x_next, y_next))
-                remaining_distance -= segment_distance
-
-                # Update position
-                x = x_next
-                y = y_next
-
-                # Flip velocity component(s) based on which boundary was hit
-                # Use epsilon for floating point comparison
-                if abs(t_x - t_y) < epsilon:
-                    # Hit corner - flip both
-                    vx = -vx
-                    vy = -vy
-                elif t_x < t_y:
-                    # Hit X boundary
-                    vx = -vx
-                else:
-                    # Hit Y boundary
-                    vy = -vy
-
-        return waypoints
+                # Hit Y boundary
+                vy = -vy
+
+    return waypoints
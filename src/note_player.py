@@ -1,15 +1,29 @@
 """High-level API for playing notes on 3D printer."""
 
 import time
-from typing import Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
 
 import serial
 
 from .config import FREQUENCY_RANGES
-from .gcode_sender import send_gcode_with_retry
+from .gcode_sender import send_gcode_batch
 from .motion_planner import MotionPlanner
 from .position_tracker import AbsolutePositionTracker
 
+if TYPE_CHECKING:
+    from .midi_parser import Melody
+
+# Prebuilt formatter for the diagonal move sent for every waypoint
+_MOVE_XY = "G1 X{:.3f} Y{:.3f} F{:.1f}".format
+
+# (use X axis, use Y axis) for a single note at each volume
+# loud: both axes (diagonal), normal: Y only, soft: X only
+_VOLUME_AXES = {
+    "loud": (True, True),
+    "normal": (False, True),
+    "soft": (True, False),
+}
+
 class NotePlayer:
     """
     Simple API for playing notes on 3D printer motors.
@@ -40,6 +54,8 @@ class NotePlayer:
         self.ser = ser
         self.tracker = tracker
         self.planner = planner
+        # Playable range; use X axis range since we assign higher freq to X
+        self._freq_min, self._freq_max = FREQUENCY_RANGES["X"]
         # Track last note frequency for each axis
         self.last_note_x: float | None = None
         self.last_note_y: float | None = None
@@ -53,7 +69,8 @@ class NotePlayer:
         freq_2: float,
         duration: float,
         volume: str = "normal",
-        debug: bool = False
+        debug: bool = False,
+        deadline: Optional[float] = None
     ) -> None:
         """
         Play one or two frequencies simultaneously using diagonal movement.
@@ -78,17 +95,17 @@ class NotePlayer:
             duration: Duration in seconds
             volume: Volume level ("loud", "normal", or "soft"), only used for single notes
             debug: Print debug information
+            deadline: time.perf_counter() value at which the note should end
+                      (default: duration from now)
 
         Raises:
-            ValueError: Invalid frequency or unknown position
+            ValueError: Invalid frequency, unknown volume or unknown position
         """
         # Validate frequencies are in range
-        for freq in [freq_1, freq_2]:
-            # Use X axis range since we assign higher freq to X
-            min_freq, max_freq = FREQUENCY_RANGES["X"]
-            if not (min_freq <= freq <= max_freq):
+        for freq in (freq_1, freq_2):
+            if not (self._freq_min <= freq <= self._freq_max):
                 raise ValueError(
-                    f"Frequency {freq} Hz out of range [{min_freq}, {max_freq}]"
+                    f"Frequency {freq} Hz out of range [{self._freq_min}, {self._freq_max}]"
                 )
 
         # Get current positions
@@ -97,23 +114,7 @@ class NotePlayer:
         if x0 is None or y0 is None:
             raise ValueError("Unknown position. Initialize tracker first.")
 
-        # Check if this is a single note or a chord
-        is_single_note = abs(freq_1 - freq_2) < 1e-6
-
-        # Determine which axes to use based on volume (only for single notes)
-        if is_single_note:
-            # loud: both axes (diagonal), normal: Y only, soft: X only
-            use_x_axis = volume in ["loud", "soft"]
-            use_y_axis = volume in ["loud", "normal"]
-        else:
-            # For chords, always use both axes
-            use_x_axis = True
-            use_y_axis = True
-
-        # Determine frequencies for each axis
-        # Motion planner assigns higher freq to X, lower to Y
-        freq_x = max(freq_1, freq_2) if use_x_axis else None
-        freq_y = min(freq_1, freq_2) if use_y_axis else None
+        freq_x, freq_y = self._assign_axes(freq_1, freq_2, volume)
 
         # Determine override directions based on whether frequencies match previous notes
         override_dir_x = None
@@ -142,62 +143,137 @@ class NotePlayer:
             self.last_dir_y = dir_y
 
         if debug:
-            # Calculate total distance
-            total_distance = 0.0
-            x_prev, y_prev = x0, y0
-            for x, y in waypoints:
-                dx = x - x_prev
-                dy = y - y_prev
-                total_distance += (dx * dx + dy * dy) ** 0.5
-                x_prev, y_prev = x, y
-
             freq_x = max(freq_1, freq_2)
             freq_y = min(freq_1, freq_2)
+            # The planner moves at the feedrate for the whole note
+            total_distance = feedrate / 60.0 * duration
             print(f"Playing: X={freq_x:.1f} Hz, Y={freq_y:.1f} Hz for {duration:.2f}s")
             print(f"  Total distance: {total_distance:.1f}mm across {len(waypoints)} waypoint(s)")
             print(f"  Feedrate: {feedrate:.1f} mm/min")
 
         # Execute all movements
-        segment_start_time = time.time()
+        if deadline is None:
+            deadline = time.perf_counter() + duration
+        commands: list[str] = []
 
+        # Follow the position locally; the tracker is updated once at the end
+        current_x, current_y = x0, y0
+        add_command = commands.append
         for i, (target_x, target_y) in enumerate(waypoints):
-            current_x = self.tracker.get_position("X")
-            current_y = self.tracker.get_position("Y")
-            if current_x is None or current_y is None:
-                raise ValueError("Lost position tracking during movement.")
-
-            dx = target_x - current_x
-            dy = target_y - current_y
-            distance = (dx * dx + dy * dy) ** 0.5
-
             if debug:
+                dx = target_x - current_x
+                dy = target_y - current_y
+                distance = (dx * dx + dy * dy) ** 0.5
                 print(f"  Waypoint {i+1}/{len(waypoints)}: "
                       f"({current_x:.1f}, {current_y:.1f}) -> ({target_x:.1f}, {target_y:.1f}) "
                       f"[{distance:.1f}mm]")
 
-            # Execute diagonal movement
-            command = f"G1 X{target_x:.3f} Y{target_y:.3f} F{feedrate:.1f}"
-            send_gcode_with_retry(self.ser, command, debug=debug)
+            # Diagonal movement to this waypoint
+            add_command(_MOVE_XY(target_x, target_y, feedrate))
+            current_x, current_y = target_x, target_y
+
+        # Queue every segment in as few writes as possible; the printer chains
+        # the moves back-to-back at the same feedrate
+        send_gcode_batch(self.ser, commands, debug=debug)
+
+        # Update tracker only once the printer has accepted the moves
+        self.tracker.set_position("X", current_x)
+        self.tracker.set_position("Y", current_y)
+
+        # Wait for the note to finish playing
+        _sleep_until(deadline)
+
+    def can_play(self, frequency: float) -> bool:
+        """
+        Check whether a frequency is within the playable range.
+
+        Args:
+            frequency: Frequency in Hz
+
+        Returns:
+            True if play_note accepts the frequency
+        """
+        return self._freq_min <= frequency <= self._freq_max
+
+    def precompute(self, melody: "Melody") -> None:
+        """
+        Warm the planner's velocity cache for every note in a melody.
+
+        Call before playback so no note pays for the conversion mid-song.
+        Out-of-range notes are skipped.
+
+        Args:
+            melody: Melody that is about to be played
+        """
+        for freq, volume in set(zip(melody.freq.tolist(), melody.vol.tolist())):
+            # NaN rests fail the range check too
+            if self.can_play(freq):
+                self.planner.axis_velocities(*self._assign_axes(freq, freq, volume))
 
-            # Update tracker
-            self.tracker.set_position("X", target_x)
-            self.tracker.set_position("Y", target_y)
+    def _assign_axes(
+        self,
+        freq_1: float,
+        freq_2: float,
+        volume: str
+    ) -> Tuple[float | None, float | None]:
+        """
+        Decide which frequency each axis plays.
 
-            # Calculate segment duration based on distance and feedrate
-            segment_duration = distance / (feedrate / 60.0)
-            time.sleep(segment_duration)
+        Args:
+            freq_1: First frequency in Hz
+            freq_2: Second frequency in Hz
+            volume: Volume level ("loud", "normal", or "soft"), only used for single notes
 
-        # Calculate any remaining time (due to rounding or small discrepancies)
-        elapsed = time.time() - segment_start_time
-        remaining = duration - elapsed
-        if remaining > 0.001:
-            time.sleep(remaining)
+        Returns:
+            Tuple of (freq_x, freq_y), with None for an unused axis
 
-    def pause(self, duration: float) -> None:
+        Raises:
+            ValueError: Unknown volume level
+        """
+        # Check if this is a single note or a chord
+        is_single_note = abs(freq_1 - freq_2) < 1e-6
+
+        # Determine which axes to use based on volume (only for single notes)
+        if is_single_note:
+            axes = _VOLUME_AXES.get(volume)
+            if axes is None:
+                raise ValueError(f"Unknown volume '{volume}'")
+            use_x_axis, use_y_axis = axes
+        else:
+            # For chords, always use both axes
+            use_x_axis = True
+            use_y_axis = True
+
+        # Determine frequencies for each axis
+        # Motion planner assigns higher freq to X, lower to Y
+        freq_x = max(freq_1, freq_2) if use_x_axis else None
+        freq_y = min(freq_1, freq_2) if use_y_axis else None
+        return freq_x, freq_y
+
+    def pause(self, duration: float, deadline: Optional[float] = None) -> None:
         """
         Pause for specified duration.
 
         Args:
             duration: Pause duration in seconds
+            deadline: time.perf_counter() value at which the pause should end
+                      (default: duration from now)
         """
-        time.sleep(duration)
+        if deadline is None:
+            deadline = time.perf_counter() + duration
+        _sleep_until(deadline)
+
+
+def _sleep_until(deadline: float) -> None:
+    """
+    Sleep until an absolute time.perf_counter() deadline.
+
+    Sleeping to a fixed end time instead of for a duration keeps scheduler
+    jitter and send overhead from accumulating across a song.
+
+    Args:
+        deadline: time.perf_counter() value to wake at
+    """
+    remaining = deadline - time.perf_counter()
+    if remaining > 0.001:
+        time.sleep(remaining)
@@ -1,5 +1,6 @@
 """Playlist management for 3D printer music player."""
 
+import os
 import random
 from pathlib import Path
 from typing import Any, Optional
@@ -27,6 +28,10 @@ class PlaylistManager:
         """
         self.playlist_path = Path(playlist_path)
         self.playlist_data: dict[str, Any] = {}
+        # Modification time of the YAML file as of the last load/save
+        self._mtime: Optional[float] = None
+        # Index of the first item that may still be unplayed
+        self._cursor = 0
 
     def load_playlist(self) -> dict[str, Any]:
         """
@@ -41,8 +46,12 @@ class PlaylistManager:
             FileNotFoundError: Playlist file not found
             yaml.YAMLError: Invalid YAML format
         """
+        mtime = os.path.getmtime(self.playlist_path)
         with open(self.playlist_path, 'r') as f:
             self.playlist_data = yaml.safe_load(f)
+        self._mtime = mtime
+        # Items may have changed on disk, so rescan from the start
+        self._cursor = 0
 
         # Ensure required keys exist
         if 'items' not in self.playlist_data:
@@ -50,6 +59,24 @@ class PlaylistManager:
 
         return self.playlist_data
 
+    def reload_if_changed(self) -> dict[str, Any]:
+        """
+        Reload playlist from YAML only if the file changed since the last load or save.
+
+        Cheaper than load_playlist() when called between every track, while still
+        picking up live edits.
+
+        Returns:
+            Playlist dictionary with 'items' key
+
+        Raises:
+            FileNotFoundError: Playlist file not found
+            yaml.YAMLError: Invalid YAML format
+        """
+        if self._mtime is not None and os.path.getmtime(self.playlist_path) == self._mtime:
+            return self.playlist_data
+        return self.load_playlist()
+
     def save_playlist(self) -> None:
         """
         Save current playlist data to YAML file.
@@ -59,6 +86,9 @@ class PlaylistManager:
         with open(self.playlist_path, 'w') as f:
             yaml.safe_dump(self.playlist_data, f, default_flow_style=False, sort_keys=False)
 
+        # Our own writes don't need to be re-read
+        self._mtime = os.path.getmtime(self.playlist_path)
+
     def get_next_unplayed_item(self) -> Optional[tuple[int, dict[str, Any]]]:
         """
         Get the next unplayed item from the playlist.
@@ -69,11 +99,31 @@ class PlaylistManager:
         """
         items = self.playlist_data.get('items', [])
 
-        # Find first unplayed item in sequential order
-        for idx, item in enumerate(items):
-            if not item.get('played', False):
-                return idx, item
+        # Find first unplayed item in sequential order. Items before the cursor
+        # are known to be played, so each item is scanned once per pass.
+        while self._cursor < len(items) and items[self._cursor].get('played', False):
+            self._cursor += 1
+
+        if self._cursor < len(items):
+            return self._cursor, items[self._cursor]
+
+        return None
+
+    def peek_unplayed_item_after(self, index: int) -> Optional[tuple[int, dict[str, Any]]]:
+        """
+        Look up the first unplayed item after the given index without consuming it.
 
+        Args:
+            index: Index of the current item
+
+        Returns:
+            Tuple of (index, item_dict) for the following unplayed item
+            None if no unplayed items follow
+        """
+        items = self.playlist_data.get('items', [])
+        for i in range(index + 1, len(items)):
+            if not items[i].get('played', False):
+                return i, items[i]
         return None
 
     def mark_as_played(self, index: int) -> None:
@@ -97,6 +147,7 @@ class PlaylistManager:
         items = self.playlist_data.get('items', [])
         random.shuffle(items)
         self.playlist_data['items'] = items
+        self._cursor = 0
         self.save_playlist()
 
     def reset_played_status(self) -> None:
@@ -108,4 +159,5 @@ class PlaylistManager:
         items = self.playlist_data.get('items', [])
         for item in items:
             item['played'] = False
+        self._cursor = 0
         self.save_playlist()
@@ -0,0 +1,25 @@
+"""Printer-facing primitives: connection, G-code, motion planning and note playback.
+
+Kept out of the package root so that MIDI-only tools (parsing, previewing)
+don't pay for importing pyserial and the playback stack.
+"""
+
+from .connection import connect_to_printer, find_printer_port
+from .gcode_sender import initialize_printer, send_gcode_batch, send_gcode_with_retry
+from .motion_planner import MotionPlanner
+from .note_player import NotePlayer
+from .position_tracker import AbsolutePositionTracker, initialize_printer_position
+from .process_priority import raise_process_priority
+
+__all__ = [
+    "AbsolutePositionTracker",
+    "MotionPlanner",
+    "NotePlayer",
+    "connect_to_printer",
+    "find_printer_port",
+    "initialize_printer",
+    "initialize_printer_position",
+    "raise_process_priority",
+    "send_gcode_batch",
+    "send_gcode_with_retry",
+]
@@ -0,0 +1,40 @@
+"""Process scheduling tweaks for steadier playback timing."""
+
+import os
+import sys
+
+# Windows priority class for SetPriorityClass
+HIGH_PRIORITY_CLASS = 0x00000080
+
+
+def raise_process_priority(pin_cpu: bool = True) -> None:
+    """
+    Reduce OS scheduling jitter during playback.
+
+    - Pins the process to a single CPU (Linux only, if pin_cpu)
+    - Raises process priority (nice -10, or HIGH_PRIORITY_CLASS on Windows)
+
+    Raising priority usually needs root/admin rights; without them a
+    warning is printed and playback continues at normal priority.
+
+    Pinning also confines any thread started afterwards to that CPU, so
+    callers that do background work alongside playback should pass
+    pin_cpu=False rather than have it compete with the playback thread.
+
+    Args:
+        pin_cpu: Pin to a single CPU so the interpreter isn't migrated mid-note
+    """
+    # Pin to one of the CPUs we are allowed on, so the interpreter isn't migrated mid-note
+    if pin_cpu and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})
+
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            if not kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), HIGH_PRIORITY_CLASS):
+                raise PermissionError("SetPriorityClass failed")
+        else:
+            os.nice(-10)
+    except OSError:
+        print("⚠ Could not raise process priority (run as root/admin for steadier timing)")
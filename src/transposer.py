@@ -1,7 +1,10 @@
 """MIDI transposition utilities for optimizing playback frequency ranges."""
 
-from typing import List, Tuple, Optional
-from .midi_parser import Note
+from typing import Tuple, Optional
+
+import numpy as np
+
+from .midi_parser import transpose_notes
 
 
 class Transposer:
@@ -16,7 +19,7 @@ class Transposer:
         """
         self.target_freq_range = target_freq_range
 
-    def analyze(self, notes: List[Note]) -> Tuple[int, List[Note]]:
+    def analyze(self, notes: np.ndarray) -> Tuple[int, np.ndarray]:
         """
         Analyze melody and suggest optimal transposition into the target frequency range.
 
@@ -25,42 +28,34 @@ class Transposer:
         note is playable, or until 99% of notes sit inside the playable range.
 
         Args:
-            notes: List of Note objects
+            notes: NOTE_DTYPE array of notes
 
         Returns:
             (suggested_semitones, transposed_notes)
             - suggested_semitones: Number of semitones to transpose up (0 if no transpose needed)
             - transposed_notes: Notes with the suggested transposition applied
         """
-        if not notes:
+        if len(notes) == 0:
             return 0, notes
 
         target_min, target_max = self.target_freq_range
         coverage_target = 0.99
 
-        best_coverage = -1.0
-        best_coverage_semitones = 0
-        selected_semitones: Optional[int] = None
-
-        for semitones in range(0, 25):  # Try from 0 up to 2 octaves
-            factor = 2.0 ** (semitones / 12.0)
-            transposed_freqs = [n.frequency * factor for n in notes]
-            transposed_min = min(transposed_freqs)
-            in_range_ratio = self._in_range_ratio(transposed_freqs)
-
-            if (
-                in_range_ratio > best_coverage
-                or (abs(in_range_ratio - best_coverage) < 1e-9 and semitones < best_coverage_semitones)
-            ):
-                best_coverage = in_range_ratio
-                best_coverage_semitones = semitones
-
-            if transposed_min >= target_min or in_range_ratio >= coverage_target:
-                selected_semitones = semitones
-                break
-
-        if selected_semitones is None:
-            selected_semitones = best_coverage_semitones
+        # Score every candidate shift (0 up to 2 octaves) in one broadcast:
+        # rows are notes, columns are semitone shifts
+        freqs = notes["frequency"].astype(np.float64)
+        factors = 2.0 ** (np.arange(0, 25) / 12.0)
+        transposed_freqs = freqs[:, None] * factors[None, :]
+        in_range_ratios = ((transposed_freqs >= target_min) & (transposed_freqs <= target_max)).mean(axis=0)
+        transposed_mins = freqs.min() * factors
+
+        # Pick the smallest shift that makes the lowest note playable or reaches the
+        # coverage target, otherwise fall back to the (smallest) shift with best coverage
+        acceptable = (transposed_mins >= target_min) | (in_range_ratios >= coverage_target)
+        if acceptable.any():
+            selected_semitones = int(np.argmax(acceptable))
+        else:
+            selected_semitones = int(np.argmax(in_range_ratios))
 
         if selected_semitones == 0:
             return 0, notes
@@ -68,43 +63,34 @@ class Transposer:
         transposed_notes = self._apply_transposition(notes, selected_semitones)
         return selected_semitones, transposed_notes
 
-    def _apply_transposition(self, notes: List[Note], semitones: int) -> List[Note]:
+    def _apply_transposition(self, notes: np.ndarray, semitones: int) -> np.ndarray:
         """
         Apply transposition to a list of notes.
 
         Args:
-            notes: List of Note objects
+            notes: NOTE_DTYPE array of notes
             semitones: Number of semitones to transpose (positive = up, negative = down)
 
         Returns:
-            List of transposed Note objects
+            NOTE_DTYPE array of transposed notes
         """
-        transposed_notes = []
-        for note in notes:
-            new_freq = note.frequency * (2.0 ** (semitones / 12.0))
-            transposed_notes.append(Note(
-                frequency=new_freq,
-                duration=note.duration,
-                velocity=note.velocity,
-                start_time=note.start_time
-            ))
-        return transposed_notes
-
-    def get_frequency_info(self, notes: List[Note]) -> dict:
+        return transpose_notes(notes, semitones)
+
+    def get_frequency_info(self, notes: np.ndarray) -> dict:
         """
         Get frequency range information for a list of notes.
 
         Args:
-            notes: List of Note objects
+            notes: NOTE_DTYPE array of notes
 
         Returns:
             Dictionary with min_freq, max_freq, and in_range status
         """
-        if not notes:
+        if len(notes) == 0:
             return {"min_freq": 0.0, "max_freq": 0.0, "in_range": False}
 
-        min_freq = min(n.frequency for n in notes)
-        max_freq = max(n.frequency for n in notes)
+        min_freq = float(notes["frequency"].min())
+        max_freq = float(notes["frequency"].max())
         target_min, target_max = self.target_freq_range
 
         return {
@@ -115,9 +101,9 @@ class Transposer:
 
     def prompt_user_for_transposition(
         self,
-        original_notes: List[Note],
+        original_notes: np.ndarray,
         suggested_semitones: int,
-        transposed_notes: List[Note]
+        transposed_notes: np.ndarray
     ) -> int:
         """
         Interactive prompt asking user to approve suggested transposition.
@@ -139,8 +125,8 @@ class Transposer:
 
         orig_info = self.get_frequency_info(original_notes)
         trans_info = self.get_frequency_info(transposed_notes)
-        orig_coverage = self._in_range_ratio([n.frequency for n in original_notes])
-        trans_coverage = self._in_range_ratio([n.frequency for n in transposed_notes])
+        orig_coverage = self._in_range_ratio(original_notes["frequency"])
+        trans_coverage = self._in_range_ratio(transposed_notes["frequency"])
 
         print(f"Original range: {orig_info['min_freq']:.1f} - {orig_info['max_freq']:.1f} Hz")
         print(f"Transposed range: {trans_info['min_freq']:.1f} - {trans_info['max_freq']:.1f} Hz")
@@ -154,7 +140,7 @@ class Transposer:
             print("✓ Playing without transpose")
             return 0
 
-    def _in_range_ratio(self, freqs: List[float]) -> float:
+    def _in_range_ratio(self, freqs: np.ndarray) -> float:
         """
         Calculate percentage of frequencies that fall inside the target range.
 
@@ -164,11 +150,11 @@ class Transposer:
         Returns:
             Ratio of frequencies inside the target range (0.0 - 1.0)
         """
-        if not freqs:
+        if len(freqs) == 0:
             return 0.0
 
         target_min, target_max = self.target_freq_range
-        in_range = sum(1 for f in freqs if target_min <= f <= target_max)
+        in_range = np.count_nonzero((freqs >= target_min) & (freqs <= target_max))
         return in_range / len(freqs)
 
 
@@ -21,16 +21,16 @@ print(f"Found {len(notes2)} notes")
 print_melody_summary(notes2)
 
 print("\n" + "=" * 70)
-print("OPTION 3: Track 1 (HARP), 0-5 seconds (more notes)")
+print("OPTION 3: Track 0 (HARP), 0-5 seconds (more notes)")
 print("=" * 70)
-notes3, _ = parse_midi_file(filename, track_index=1, transpose_semitones=transpose_semitones, start_time=0, end_time=5)
+notes3, _ = parse_midi_file(filename, track_index=0, transpose_semitones=transpose_semitones, start_time=0, end_time=5)
 print(f"Found {len(notes3)} notes")
 print_melody_summary(notes3)
 
 print("\n" + "=" * 70)
-print("OPTION 4: Track 1 (HARP), 2-7 seconds (even more notes)")
+print("OPTION 4: Track 0 (HARP), 2-7 seconds (even more notes)")
 print("=" * 70)
-notes4, _ = parse_midi_file(filename, track_index=1, transpose_semitones=transpose_semitones, start_time=2, end_time=7)
+notes4, _ = parse_midi_file(filename, track_index=0, transpose_semitones=transpose_semitones, start_time=2, end_time=7)
 print(f"Found {len(notes4)} notes")
 print_melody_summary(notes4)
 